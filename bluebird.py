@@ -1,9 +1,10 @@
 import logging
+import signal
 import tomllib
 from os import environ
 from sys import stdout
 from threading import Thread
-from time import sleep
+from time import perf_counter, sleep
 from typing import Any
 
 from environs import env
@@ -11,6 +12,10 @@ from loguru import logger
 from loguru_discord import DiscordSink
 
 from core.intercept import Intercept
+from core.memory import Memory
+from core.profile import Profiler
+from core.replay import Recorder, Replayer
+from core.schedule import Scheduler
 from core.x import XInstance
 
 
@@ -61,12 +66,152 @@ def start() -> None:
     logger.info(f"Loaded {len(instances):,} instances from config.toml")
     logger.trace(f"{config=}")
 
-    for index, config in enumerate(instances.get("x", [])):
-        Thread(target=XInstance().start, args=[config, index], daemon=True).start()
+    if environ.get("REPLAY_PATH"):
+        replay(instances, env.str("REPLAY_PATH"), env.bool("REPLAY_REALTIME", False))
+
+        return
+
+    if environ.get("RECORD_PATH"):
+        XInstance.recorder = Recorder(env.str("RECORD_PATH"))
+
+        logger.info(f"Recording responses to {XInstance.recorder.path}")
+
+    if budget := config.get("poll_budget"):
+        Thread(
+            target=schedule,
+            args=[
+                instances,
+                budget,
+                config.get("poll_interval_min", 60.0),
+                config.get("poll_interval_max", 3600.0),
+            ],
+            name="X[*]",
+            daemon=True,
+        ).start()
+    else:
+        for index, config in enumerate(instances.get("x", [])):
+            Thread(
+                target=XInstance().start,
+                args=[config, index],
+                name=f"X[{index}]",
+                daemon=True,
+            ).start()
+
+    profiler: Profiler = Profiler(
+        env.float("PROFILE_DURATION", 30.0),
+        env.float("PROFILE_INTERVAL", 0.01),
+        env.str("PROFILE_PATH", "profiles"),
+        env.bool("PROFILE_IDLE", False),
+    )
+
+    # Allow profiling a live process on demand, signals are unavailable on Windows
+    if hasattr(signal, "SIGUSR1"):
+        # Logging within a signal handler may deadlock, so defer to a thread
+        Thread(target=profiler.listen, name="Profiler", daemon=True).start()
+
+        signal.signal(signal.SIGUSR1, lambda signum, frame: profiler.request())
+
+        logger.debug("Send SIGUSR1 to profile instances")
+
+    if env.bool("PROFILE", False):
+        profiler.start()
+
+    usernames: int = sum(
+        len(config.get("usernames", [])) for config in instances.get("x", [])
+    )
 
     # Keep parent thread alive so child threads continue to run
     while True:
-        sleep(1)
+        sleep(60)
+
+        if rss := Memory.resident():
+            logger.debug(
+                f"Resident memory {rss / 1048576:,.1f} MiB ({usernames:,} usernames)"
+            )
+
+
+def schedule(
+    instances: dict[str, list[dict[str, Any]]],
+    budget: float,
+    interval_min: float,
+    interval_max: float,
+) -> None:
+    """Check the usernames of every X instance within a global budget."""
+    scheduled: list[XInstance] = []
+    users: list[tuple[int, str]] = []
+
+    for index, config in enumerate(instances.get("x", [])):
+        instance: XInstance = XInstance()
+
+        instance.configure(config, index)
+        scheduled.append(instance)
+        users.extend((index, username) for username in instance.usernames)
+
+    if not users:
+        logger.warning("Skipped scheduling, no usernames configured")
+
+        return
+
+    scheduler: Scheduler = Scheduler(users, budget, interval_min, interval_max)
+
+    for instance in scheduled:
+        instance.scheduler = scheduler
+
+    logger.info(
+        f"Scheduling {len(users):,} usernames within {budget:,} checks per minute"
+    )
+
+    while True:
+        index, username = scheduler.next()
+
+        # A failed check must not stop polling for every instance
+        try:
+            scheduled[index].check(username)
+        except Exception as e:
+            logger.opt(exception=e).error(
+                f"X[{index:,}][@{username}] Failed to check user"
+            )
+
+
+def replay(
+    instances: dict[str, list[dict[str, Any]]], path: str, realtime: bool
+) -> None:
+    """Feed a recorded archive through the X instances without network access."""
+    try:
+        XInstance.replayer = Replayer(path)
+    except Exception as e:
+        logger.opt(exception=e).critical(f"Failed to load archive {path}")
+
+        return
+
+    replays: list[XInstance] = []
+
+    for index, config in enumerate(instances.get("x", [])):
+        instance: XInstance = XInstance()
+
+        instance.configure(config, index)
+        replays.append(instance)
+
+    started: float = perf_counter()
+    count: int = 0
+
+    # Notifications are built and serialized as usual, but never sent
+    with XInstance.replayer.stub():
+        for index, username in XInstance.replayer.timeline(realtime):
+            if index >= len(replays):
+                logger.warning(
+                    f"Skipped replay of @{username}, X[{index:,}] not configured"
+                )
+
+                continue
+
+            replays[index].watch_user(username)
+
+            count += 1
+
+    logger.success(
+        f"Replayed {count:,} user responses and {XInstance.replayer.delivered:,} notifications in {perf_counter() - started:,.2f}s"
+    )
 
 
 if __name__ == "__main__":
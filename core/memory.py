@@ -0,0 +1,22 @@
+import os
+
+from loguru import logger
+
+
+class Memory:
+    """Utility class containing static methods for reporting memory usage."""
+
+    @staticmethod
+    def resident() -> int | None:
+        """
+        Return the current resident set size (in bytes) of the process, or
+        None where only peak usage is available (non-Linux platforms).
+        """
+        try:
+            # Current usage is only exposed by procfs on Linux
+            with open("/proc/self/statm", "r") as file:
+                return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        except Exception as e:
+            logger.opt(exception=e).trace("Failed to determine resident memory")
+
+        return None
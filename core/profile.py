@@ -0,0 +1,208 @@
+import sys
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from os import makedirs, path
+from threading import Event, Lock, Thread
+from threading import enumerate as threads
+from time import perf_counter, sleep
+from types import CodeType, FrameType
+from typing import Self
+
+from loguru import logger
+
+
+class Profiler:
+    """Sampling profiler for the threads of running X instances."""
+
+    duration: float
+    interval: float
+    directory: str
+    idle: bool
+    lock: Lock
+    requested: Event
+
+    def __init__(
+        self: Self, duration: float, interval: float, directory: str, idle: bool
+    ) -> None:
+        """Prepare a profiler without starting it."""
+        self.duration = duration
+        self.interval = interval
+        self.directory = directory
+        self.idle = idle
+        self.lock = Lock()
+        self.requested = Event()
+
+    def request(self: Self) -> None:
+        """Ask for a profile without logging, safe to call from a signal handler."""
+        self.requested.set()
+
+    def listen(self: Self) -> None:
+        """Run a continuous loop which starts the profiler once requested."""
+        while True:
+            self.requested.wait()
+            self.requested.clear()
+
+            self.start()
+
+    def start(self: Self) -> None:
+        """Begin sampling in a background thread if not already running."""
+        if not self.lock.acquire(blocking=False):
+            logger.warning("Skipped profiling request, profiler already running")
+
+            return
+
+        logger.info(f"Profiling instances for {self.duration:,}s...")
+
+        Thread(target=self.run, name="Profiler", daemon=True).start()
+
+    def run(self: Self) -> None:
+        """Sample the instance threads and write the results to disk."""
+        try:
+            self.write(*self.sample())
+        except Exception as e:
+            logger.opt(exception=e).error("Failed to profile instances")
+        finally:
+            self.lock.release()
+
+    def sample(
+        self: Self,
+    ) -> tuple[Counter[str], Counter[str], Counter[str], int, bool]:
+        """
+        Periodically capture the call stack of every X instance thread. Unless
+        idle stacks are requested, each stack is weighted by the CPU time (in
+        microseconds) its thread consumed since the previous sample.
+        """
+        stacks: Counter[str] = Counter()
+        functions_self: Counter[str] = Counter()
+        functions_total: Counter[str] = Counter()
+        samples: int = 0
+        deadline: float = perf_counter() + self.duration
+        idle: bool = self.idle
+        cpu: dict[int, float] = {}
+
+        # Per-thread CPU clocks are unavailable on Windows
+        if not idle and not hasattr(time, "pthread_getcpuclockid"):
+            logger.warning("Per-thread CPU time unavailable, profiling wall-clock")
+
+            idle = True
+
+        while perf_counter() < deadline:
+            names: dict[int | None, str] = {
+                thread.ident: thread.name for thread in threads()
+            }
+
+            for ident, frame in sys._current_frames().items():
+                name: str | None = names.get(ident)
+
+                # Only X instance threads are of interest
+                if not name or not name.startswith("X["):
+                    continue
+
+                weight: int = 1
+
+                if not idle and not (weight := Profiler.consumed(ident, cpu)):
+                    continue
+
+                functions: list[str] = []
+                lines: list[str] = []
+                current: FrameType | None = frame
+
+                while current:
+                    function: str = Profiler.label(current)
+
+                    functions.append(function)
+                    lines.append(f"{function}:{current.f_lineno}")
+
+                    current = current.f_back
+
+                stacks[";".join([name, *reversed(lines)])] += weight
+                functions_self[functions[0]] += weight
+
+                for function in set(functions):
+                    functions_total[function] += weight
+
+            samples += 1
+
+            sleep(self.interval)
+
+        return stacks, functions_self, functions_total, samples, idle
+
+    def write(
+        self: Self,
+        stacks: Counter[str],
+        functions_self: Counter[str],
+        functions_total: Counter[str],
+        samples: int,
+        idle: bool,
+    ) -> None:
+        """Write a collapsed stack file and a top functions summary."""
+        makedirs(self.directory, exist_ok=True)
+
+        name: str = datetime.now(timezone.utc).strftime("profile-%Y%m%dT%H%M%SZ")
+        file_stacks: str = path.join(self.directory, f"{name}.collapsed")
+        file_summary: str = path.join(self.directory, f"{name}.txt")
+        total: int = sum(functions_self.values())
+        clock: str = "wall-clock, including idle" if idle else "CPU time"
+        weight: str = (
+            f"{total:,} thread stacks, {clock}"
+            if idle
+            else f"{total / 1000:,.1f}ms of {clock}"
+        )
+
+        with open(file_stacks, "w") as file:
+            for stack, count in stacks.most_common():
+                file.write(f"{stack} {count}\n")
+
+        summary: list[str] = [
+            f"{samples:,} samples over {self.duration:,}s ({weight})",
+            "",
+            f"{'Self':>7} {'Total':>7}  Function",
+        ]
+
+        for function, count in functions_self.most_common(50):
+            summary.append(
+                f"{Profiler.percent(count, total):>7} {Profiler.percent(functions_total[function], total):>7}  {function}"
+            )
+
+        with open(file_summary, "w") as file:
+            file.write("\n".join(summary) + "\n")
+
+        logger.success(f"Saved {clock} profile to {file_stacks} and {file_summary}")
+
+        for function, count in functions_self.most_common(10):
+            logger.info(f"Profile {Profiler.percent(count, total)} {function}")
+
+    @staticmethod
+    def consumed(ident: int, cpu: dict[int, float]) -> int:
+        """Return the CPU time (in microseconds) the provided thread consumed since last checked."""
+        try:
+            current: float = time.clock_gettime(time.pthread_getcpuclockid(ident))
+        except Exception:
+            # Thread exited between enumeration and sampling
+            return 0
+
+        previous: float | None = cpu.get(ident)
+        cpu[ident] = current
+
+        if previous is None:
+            return 0
+
+        return int((current - previous) * 1_000_000)
+
+    @staticmethod
+    def label(frame: FrameType) -> str:
+        """Craft a flamegraph-safe label for the function of the provided frame."""
+        code: CodeType = frame.f_code
+
+        return f"{code.co_qualname} ({path.basename(code.co_filename)})".replace(
+            ";", ":"
+        )
+
+    @staticmethod
+    def percent(count: int, total: int) -> str:
+        """Format a sample count as a percentage of the total."""
+        if not total:
+            return "0.0%"
+
+        return f"{(count / total) * 100:.1f}%"
@@ -0,0 +1,170 @@
+import atexit
+import gzip
+import json
+from collections.abc import Iterator
+from contextlib import contextmanager
+from gzip import GzipFile
+from threading import Lock
+from time import sleep, time
+from typing import Any, Self
+from urllib.parse import urlsplit
+
+import httpx
+from httpx import Client, MockTransport, Request, Response
+from loguru import logger
+
+
+class Recorder:
+    """Class for appending raw vxtwitter responses to a compressed archive."""
+
+    path: str
+    lock: Lock
+    file: GzipFile
+
+    # Bodies are stored decoded, so transport headers no longer apply
+    ignore_headers: tuple[str, ...] = (
+        "content-encoding",
+        "content-length",
+        "transfer-encoding",
+    )
+
+    def __init__(self: Self, path: str) -> None:
+        """Prepare a recorder for the provided archive path."""
+        self.path = path
+        self.lock = Lock()
+
+        # A single stream lets repeated responses compress against each other
+        self.file = gzip.open(path, "ab")
+
+        atexit.register(self.close)
+
+    def write(self: Self, index: int, kind: str, res: Response) -> None:
+        """Append the provided response to the archive."""
+        entry: dict[str, Any] = {
+            "time": time(),
+            "index": index,
+            "kind": kind,
+            "url": str(res.url),
+            "status": res.status_code,
+            "headers": {
+                key: value
+                for key, value in res.headers.items()
+                if key not in Recorder.ignore_headers
+            },
+            "body": res.text,
+        }
+
+        line: bytes = (json.dumps(entry, separators=(",", ":")) + "\n").encode("utf-8")
+
+        # Instances record concurrently from separate threads
+        with self.lock:
+            self.file.write(line)
+
+            # Flush so the archive remains readable if the process is killed
+            self.file.flush()
+
+        logger.trace(f"Recorded {kind} response {entry['url']}")
+
+    def close(self: Self) -> None:
+        """Finish the compressed stream and close the archive."""
+        with self.lock:
+            self.file.close()
+
+
+class Replayer:
+    """Class for serving recorded vxtwitter responses in place of the network."""
+
+    users: list[dict[str, Any]]
+    posts: dict[str, dict[str, Any]]
+    current: dict[str, dict[str, Any]]
+    delivered: int
+
+    def __init__(self: Self, path: str) -> None:
+        """Load the recorded responses from the provided archive path."""
+        self.users = []
+        self.posts = {}
+        self.current = {}
+        self.delivered = 0
+
+        with gzip.open(path, "rt", encoding="utf-8") as file:
+            try:
+                for line in file:
+                    entry: dict[str, Any] = json.loads(line)
+
+                    if entry["kind"] == "user":
+                        self.users.append(entry)
+                    else:
+                        # Posts rarely change, keep the earliest recording
+                        self.posts.setdefault(Replayer.key(entry["url"]), entry)
+            except EOFError:
+                # Recording was interrupted, flushed entries remain intact
+                logger.warning(f"Archive {path} ended unexpectedly, loaded until end")
+
+        self.users.sort(key=lambda entry: entry["time"])
+
+        logger.info(
+            f"Loaded {len(self.users):,} user and {len(self.posts):,} post responses from {path}"
+        )
+
+    def timeline(self: Self, realtime: bool) -> Iterator[tuple[int, str]]:
+        """
+        Yield the instance index and username of each recorded user
+        response, optionally waiting between them as originally recorded.
+        """
+        previous: float | None = None
+
+        for entry in self.users:
+            if realtime and previous is not None:
+                sleep(max(entry["time"] - previous, 0.0))
+
+            previous = entry["time"]
+            key: str = Replayer.key(entry["url"])
+
+            self.current[key] = entry
+
+            yield entry["index"], key.rsplit("/", 1)[-1]
+
+    def request(self: Self, url: str) -> Response:
+        """Build a response for the provided URL from the archive."""
+        key: str = Replayer.key(url)
+        entry: dict[str, Any] | None = self.current.get(key) or self.posts.get(key)
+
+        if not entry:
+            return Response(404, request=Request("GET", url))
+
+        return Response(
+            entry["status"],
+            headers=entry["headers"],
+            text=entry["body"],
+            request=Request("GET", entry["url"]),
+        )
+
+    @contextmanager
+    def stub(self: Self) -> Iterator[None]:
+        """Route Discord Webhook executions to an in-memory transport."""
+        post = httpx.post
+
+        httpx.post = self.post
+
+        try:
+            yield
+        finally:
+            httpx.post = post
+
+    def post(self: Self, url: str, **kwargs: Any) -> Response:
+        """Send the provided request through an in-memory transport."""
+        with Client(transport=MockTransport(self.deliver)) as client:
+            return client.post(url, **kwargs)
+
+    def deliver(self: Self, request: Request) -> Response:
+        """Accept the provided Discord Webhook request without sending it."""
+        self.delivered += 1
+
+        logger.debug(f"Delivered {len(request.content):,} bytes to stubbed Webhook")
+
+        return Response(204)
+
+    @staticmethod
+    def key(url: str) -> str:
+        """Identify a recorded response by its URL path."""
+        return urlsplit(url).path
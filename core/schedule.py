@@ -0,0 +1,141 @@
+import heapq
+from array import array
+from math import sqrt
+from time import sleep, time
+from typing import Self
+
+from loguru import logger
+
+
+class Scheduler:
+    """
+    Class for splitting a global polls-per-minute budget across the X
+    usernames of every instance, each identified by (instance index, username).
+    """
+
+    users: list[tuple[int, str]]
+    budget: float
+    rate_min: float
+    rate_max: float
+    spacing: float
+    scale: float
+    allocated: float
+    checked: float
+    history: dict[tuple[int, str], array]
+    queue: list[tuple[float, tuple[int, str]]]
+    lag: float
+
+    # Number of recent post timestamps kept to estimate posting rate
+    history_limit: int = 20
+
+    # Amount of time (in seconds) between reallocations of the budget
+    allocate_interval: float = 60.0
+
+    def __init__(
+        self: Self,
+        users: list[tuple[int, str]],
+        budget: float,
+        interval_min: float,
+        interval_max: float,
+    ) -> None:
+        """Prepare a schedule which checks each username once to begin."""
+        self.users = users
+        self.budget = budget / 60.0
+        self.rate_min = 1.0 / interval_max
+        self.rate_max = 1.0 / interval_min
+        self.spacing = 60.0 / budget
+        self.scale = 0.0
+        self.allocated = 0.0
+        self.checked = 0.0
+        self.history = {}
+        self.lag = 0.0
+
+        # Reserve at most half of the budget for the minimum rate, the
+        # remainder is left for active users
+        if len(users) * self.rate_min > self.budget:
+            self.rate_min = self.budget / (2 * len(users))
+
+            logger.warning(
+                f"Cannot check {len(users):,} usernames every {int(interval_max):,}s within {budget:,} checks per minute, extended maximum interval to {int(1.0 / self.rate_min):,}s"
+            )
+
+        # Stagger the initial checks so they are not counted as late
+        now: float = time()
+
+        self.queue = [
+            (now + (index * self.spacing), user) for index, user in enumerate(users)
+        ]
+
+        heapq.heapify(self.queue)
+
+    def next(self: Self) -> tuple[int, str]:
+        """
+        Wait until a username is due to be checked and return it. Checks are
+        never closer together than the budget allows to avoid bursts.
+        """
+        due, user = heapq.heappop(self.queue)
+
+        if (wait := max(due, self.checked + self.spacing) - time()) > 0:
+            sleep(wait)
+
+        self.checked = time()
+        self.lag = max(self.checked - due, 0.0)
+
+        return user
+
+    def observe(self: Self, user: tuple[int, str], epochs: list[int]) -> None:
+        """Record the post timestamps seen for the provided username."""
+        # Packed integers are far smaller than a list of int objects
+        self.history[user] = array("q", sorted(epochs)[-self.history_limit :])
+
+    def reschedule(self: Self, user: tuple[int, str], max_age: float | None) -> float:
+        """Queue the next check of the provided username and return its interval."""
+        now: float = time()
+
+        if now - self.allocated >= self.allocate_interval:
+            self.allocate(now)
+
+        interval: float = 1.0 / self.clamp(self.scale * self.weight(user, now))
+
+        # Checking sooner than the upstream cache allows returns stale data
+        interval = max(interval, max_age or 0.0)
+
+        heapq.heappush(self.queue, (now + interval, user))
+
+        return interval
+
+    def weight(self: Self, user: tuple[int, str], now: float) -> float:
+        """
+        Weight the provided username by the square root of its posting rate
+        (posts per second), which minimizes the average delay between a post
+        and its check.
+        """
+        epochs: array | None = self.history.get(user)
+        rate: float = 0.0
+
+        if epochs:
+            # Measuring up to now lets dormant users decay towards zero
+            rate = len(epochs) / max(now - epochs[0], 3600.0)
+
+        return sqrt(rate + 1e-8)
+
+    def clamp(self: Self, rate: float) -> float:
+        """Limit the provided check rate to the configured bounds."""
+        return min(max(rate, self.rate_min), self.rate_max)
+
+    def allocate(self: Self, now: float) -> None:
+        """Find the weight scale at which the clamped check rates fill the budget."""
+        weights: list[float] = [self.weight(user, now) for user in self.users]
+        low: float = 0.0
+        high: float = self.rate_max / min(weights)
+
+        for _ in range(40):
+            scale: float = (low + high) / 2
+
+            if sum(self.clamp(scale * weight) for weight in weights) > self.budget:
+                high = scale
+            else:
+                low = scale
+
+        self.scale = low
+        self.allocated = now
@@ -29,6 +29,8 @@ from httpx import Response
 from loguru import logger
 
 from .format import Format
+from .replay import Recorder, Replayer
+from .schedule import Scheduler
 
 pattern_post_url: Pattern[str] = re.compile(
     r"https://twitter\.com/([^/]+)/status/(\d+)"
@@ -40,7 +42,7 @@ class XInstance:
 
     base_url: str = "https://x.com/"
     index: int
-    state: dict[str, int] = {}
+    state: dict[str, int]
     usernames: list[str]
     webhook_url: str | None
     require_media: bool | None
@@ -48,6 +50,12 @@ class XInstance:
     exclude_reply: bool | None
     exclude_repost: bool | None
     exclude_keyword: list[str] | None
+    scheduler: Scheduler | None = None
+    shed_backlog: int | None
+    shed_lag: float | None
+    shedding: bool = False
+    recorder: Recorder | None = None
+    replayer: Replayer | None = None
 
     def log(self: Self, username: str | None = None, post_id: str | None = None) -> str:
         """Craft the head of a log message given an instance and username."""
@@ -63,9 +71,10 @@ class XInstance:
 
         return head
 
-    def start(self: Self, config: dict[str, Any], index: int) -> None:
-        """Run a continuous loop for the usernames within the X instance."""
+    def configure(self: Self, config: dict[str, Any], index: int) -> None:
+        """Apply the provided configuration to the X instance."""
         self.index = index
+        self.state = {}
         self.usernames = config.get("usernames", [])
         self.webhook_url = config.get("discord_webhook_url")
         self.require_media = config.get("require_media")
@@ -73,10 +82,16 @@ class XInstance:
         self.exclude_reply = config.get("exclude_reply")
         self.exclude_repost = config.get("exclude_repost")
         self.exclude_keyword = config.get("exclude_keyword")
+        self.shed_backlog = config.get("shed_backlog")
+        self.shed_lag = config.get("shed_lag")
 
         logger.info(f"{self.log()} Loaded instance configuration")
         logger.trace(f"{self.log()} {self=}")
 
+    def start(self: Self, config: dict[str, Any], index: int) -> None:
+        """Run a continuous loop for the usernames within the X instance."""
+        self.configure(config, index)
+
         cooldown: float = config.get("cooldown", 60.0)
 
         while True:
@@ -97,6 +112,28 @@ class XInstance:
 
             sleep(cooldown)
 
+    def check(self: Self, username: str) -> None:
+        """Check the provided username once and queue its next scheduled check."""
+        if not self.scheduler:
+            return
+
+        if environ.get("DEBUG_STATE"):
+            self.state[username] = env.int("DEBUG_STATE")
+
+        max_age: float | None = None
+
+        # Always queue the next check, even if this one fails
+        try:
+            max_age = self.watch_user(username)
+        except Exception as e:
+            logger.opt(exception=e).error(f"{self.log(username)} Failed to check user")
+
+        interval: float = self.scheduler.reschedule((self.index, username), max_age)
+
+        logger.debug(
+            f"{self.log(username)} Next check in {int(interval):,}s ({self.scheduler.lag:,.1f}s late)"
+        )
+
     def watch_user(self: Self, username: str) -> float | None:
         """
         Processes user data and trigger notifications upon the discovery
@@ -108,10 +145,22 @@ class XInstance:
 
         if not data or not data.get("latest_tweets"):
             logger.debug(f"{self.log(username)} Received invalid data")
-            logger.trace(f"{self.log(username)} {data=}")
+            logger.opt(lazy=True).trace(
+                "{} {}", lambda: self.log(username), lambda: f"{data=}"
+            )
 
             return
 
+        if self.scheduler:
+            self.scheduler.observe(
+                (self.index, username),
+                [
+                    post["date_epoch"]
+                    for post in data["latest_tweets"]
+                    if post.get("date_epoch")
+                ],
+            )
+
         # Use proper username if available
         username = data.get("screen_name", username)
 
@@ -128,7 +177,24 @@ class XInstance:
 
                     return
 
-        for post in posts:
+        bio: str | None = data.get("description")
+        max_age: float | None = data.get("max_age")
+        count: int = len(posts)
+
+        # Keep only new posts so the remaining response is released early
+        posts = [
+            post
+            for post in posts
+            if not post.get("date_epoch") or post["date_epoch"] > self.state[username]
+        ]
+
+        del data
+
+        logger.debug(
+            f"{self.log(username)} Skipped {count - len(posts):,} posts, not new"
+        )
+
+        for index, post in enumerate(posts):
             post_id: str | None = post.get("tweetID")
             post_epoch: int | None = post.get("date_epoch")
 
@@ -154,7 +220,9 @@ class XInstance:
                 logger.info(
                     f"{self.log(username)} Set latest state ({self.state[username]})"
                 )
-                logger.trace(f"{self.log(username)} {self.state=}")
+                logger.opt(lazy=True).trace(
+                    "{} {}", lambda: self.log(username), lambda: f"{self.state=}"
+                )
 
             if self.require_keyword:
                 keyword_found: str | None = None
@@ -245,11 +313,22 @@ class XInstance:
 
                 continue
 
-            self.notify(username, post_id, post)
+            # Include this post and any newer posts still awaiting processing
+            backlog: int = 1 + len(
+                [
+                    later
+                    for later in posts[index + 1 :]
+                    if later.get("date_epoch", 0) > self.state[username]
+                ]
+            )
+
+            post["user_bio"] = bio
+
+            self.notify(username, post_id, post, self.shed(backlog))
 
-        logger.info(f"{self.log(username)} {len(posts):,} posts processed")
+        logger.info(f"{self.log(username)} {count:,} posts processed")
 
-        return data.get("max_age")
+        return max_age
 
     def fetch_user(self: Self, username: str) -> dict[str, Any] | None:
         """Fetch the latest available data for the provided X username."""
@@ -257,13 +336,13 @@ class XInstance:
         res: None | Response = None
 
         try:
-            res = httpx.get(
+            res = self.request(
+                "user",
                 f"https://api.vxtwitter.com/{username}",
-                params={
+                {
                     "with_tweets": True,
                     "timestamp": int(datetime.now(timezone.utc).timestamp()),
                 },
-                headers={"User-Agent": "https://github.com/EthanC/Bluebird"},
             ).raise_for_status()
 
             logger.debug(f"{self.log(username)} Requested data for user")
@@ -283,7 +362,6 @@ class XInstance:
 
             # Add miscellaneous data to each post object
             for post in data["latest_tweets"]:
-                post["user_bio"] = data.get("description")
                 post["is_repost"] = bool(post.get("retweetURL") or post.get("retweet"))
                 post["is_quote"] = bool(post.get("qrtURL"))
                 post["is_reply"] = bool(
@@ -309,7 +387,9 @@ class XInstance:
             return data
 
         logger.debug(f"{self.log(username)} Fetched data for user")
-        logger.trace(f"{self.log(username)} {data=}")
+        logger.opt(lazy=True).trace(
+            "{} {}", lambda: self.log(username), lambda: f"{data=}"
+        )
 
         return data
 
@@ -318,9 +398,8 @@ class XInstance:
         data: dict[str, Any] = {}
 
         try:
-            res: Response = httpx.get(
-                f"https://api.vxtwitter.com/{username}/status/{post_id}",
-                headers={"User-Agent": "https://github.com/EthanC/Bluebird"},
+            res: Response = self.request(
+                "post", f"https://api.vxtwitter.com/{username}/status/{post_id}"
             ).raise_for_status()
 
             logger.debug(f"{self.log(username, post_id)} Requested post data")
@@ -339,17 +418,72 @@ class XInstance:
             return data
 
         logger.debug(f"{self.log(username, post_id)} Fetched post data")
-        logger.trace(f"{self.log(username, post_id)} {data=}")
+        logger.opt(lazy=True).trace(
+            "{} {}", lambda: self.log(username, post_id), lambda: f"{data=}"
+        )
 
         return data
 
+    def request(
+        self: Self, kind: str, url: str, params: dict[str, Any] | None = None
+    ) -> Response:
+        """Request the provided vxtwitter URL, recording or replaying if enabled."""
+        if self.replayer:
+            return self.replayer.request(url)
+
+        res: Response = httpx.get(
+            url,
+            params=params,
+            headers={"User-Agent": "https://github.com/EthanC/Bluebird"},
+        )
+
+        if self.recorder:
+            try:
+                self.recorder.write(self.index, kind, res)
+            except Exception as e:
+                logger.opt(exception=e).error(f"{self.log()} Failed to record response")
+
+        return res
+
+    def shed(self: Self, backlog: int) -> bool:
+        """
+        Determine whether post context should be skipped to reduce upstream
+        requests, given the number of posts awaiting notification.
+        """
+        lag: float = self.scheduler.lag if self.scheduler else 0.0
+        shedding: bool = bool(
+            (self.shed_backlog is not None and backlog > self.shed_backlog)
+            or (self.shed_lag is not None and lag > self.shed_lag)
+        )
+
+        if shedding != self.shedding:
+            self.shedding = shedding
+
+            if shedding:
+                logger.warning(
+                    f"{self.log()} Skipping post context, backlog of {backlog:,} posts ({lag:,.1f}s late)"
+                )
+            else:
+                logger.info(f"{self.log()} Resumed post context, backlog cleared")
+
+        return shedding
+
     def notify(
-        self: Self, username: str, post_id: str | None, post: dict[str, Any]
+        self: Self,
+        username: str,
+        post_id: str | None,
+        post: dict[str, Any],
+        shed: bool = False,
     ) -> None:
         """Send a Discord Webhook notification for the provided X post."""
         webhook: Webhook = Webhook(url=self.webhook_url)
 
-        if post.get("is_reply") and post.get("replyingTo") and post.get("replyingToID"):
+        if (
+            not shed
+            and post.get("is_reply")
+            and post.get("replyingTo")
+            and post.get("replyingToID")
+        ):
             reply_parent: dict[str, Any] = self.fetch_post(
                 post["replyingTo"], post["replyingToID"]
             )
@@ -358,9 +492,9 @@ class XInstance:
                 self.build_post(username, post_id, reply_parent, True)
             )
 
-        webhook.add_component(self.build_post(username, post_id, post))
+        webhook.add_component(self.build_post(username, post_id, post, shed=shed))
 
-        if post.get("is_quote") and post.get("qrtURL"):
+        if not shed and post.get("is_quote") and post.get("qrtURL"):
             if re_match := re.match(pattern_post_url, post["qrtURL"]):
                 quote_username: str = re_match.group(1)
                 quote_post: dict[str, Any] = self.fetch_post(
@@ -375,7 +509,7 @@ class XInstance:
                     f"{self.log(username, post_id)} Failed to process Quote Post {post['qrtURL']}"
                 )
 
-        if post.get("is_repost") and post.get("retweetURL"):
+        if not shed and post.get("is_repost") and post.get("retweetURL"):
             if re_match := re.match(pattern_post_url, post["retweetURL"]):
                 repost_username: str = re_match.group(1)
                 repost: dict[str, Any] = self.fetch_post(
@@ -405,8 +539,12 @@ class XInstance:
         post_id: str | None,
         post: dict[str, Any],
         mini: bool = False,
+        shed: bool = False,
     ) -> Container:
-        """Build a Discord Container Component for the provided X post."""
+        """
+        Build a Discord Container Component for the provided X post. Reposts
+        keep their own body and media when shedding, as the original is absent.
+        """
         container: Container = Container(accent_color="#000000")
 
         head: TextDisplay | Section = self.build_post_head(
@@ -418,10 +556,10 @@ class XInstance:
 
         container.add_component(head)
 
-        if body and not post.get("is_repost"):
+        if body and (shed or not post.get("is_repost")):
             container.add_component(body)
 
-        if media and not post.get("is_repost"):
+        if media and (shed or not post.get("is_repost")):
             container.add_component(media)
 
         container.add_component(Seperator(divider=True, spacing=SeperatorSpacing.SMALL))
@@ -0,0 +1,102 @@
+import gc
+import heapq
+import sys
+import tracemalloc
+from time import time
+from typing import Any
+
+from loguru import logger
+
+from core.memory import Memory
+from core.schedule import Scheduler
+from core.x import XInstance
+
+# Documented retained memory budget (in bytes) for each username
+BUDGET: int = 1024
+
+USERNAMES: int = 10_000
+POSTS: int = 20
+
+
+def fetch_user(self: XInstance, username: str) -> dict[str, Any]:
+    """Build a response resembling vxtwitter for the provided username."""
+    now: int = int(time())
+    posts: list[dict[str, Any]] = [
+        {
+            "tweetID": str(index),
+            "date_epoch": now - (index * 3600),
+            "text": "x" * 280,
+            "tweetURL": f"https://twitter.com/{username}/status/{index}",
+            "media_extended": [
+                {"url": f"https://pbs.twimg.com/media/{'a' * 40}", "altText": "alt"}
+            ],
+            "user_name": username,
+            "user_screen_name": username,
+            "user_profile_image_url": f"https://pbs.twimg.com/{'b' * 60}",
+            "is_repost": False,
+            "is_quote": False,
+            "is_reply": False,
+        }
+        for index in range(POSTS)
+    ]
+
+    return {
+        "screen_name": username,
+        "description": "bio " * 40,
+        "latest_tweets": sorted(posts, key=lambda post: post["date_epoch"]),
+        "max_age": 60.0,
+    }
+
+
+def measure() -> int:
+    """
+    Check every username twice, as the first check only sets state, and
+    return the memory retained (in bytes) for each username. Tracing begins
+    before any per-username structure is created so all of them are counted.
+    """
+    gc.collect()
+    tracemalloc.start()
+
+    usernames: list[str] = [f"user{index}" for index in range(USERNAMES)]
+    instance: XInstance = XInstance()
+
+    instance.configure({"usernames": usernames}, 0)
+
+    instance.scheduler = Scheduler(
+        [(0, username) for username in usernames], 600.0, 60.0, 3600.0
+    )
+    instance.fetch_user = fetch_user.__get__(instance)
+
+    for _ in range(2):
+        for username in usernames:
+            # Stand in for Scheduler.next() without waiting, check() queues again
+            heapq.heappop(instance.scheduler.queue)
+
+            instance.check(username)
+
+    gc.collect()
+
+    retained, peak = tracemalloc.get_traced_memory()
+
+    tracemalloc.stop()
+
+    print(f"Peak {peak / 1048576:,.1f} MiB while checking {USERNAMES:,} usernames")
+
+    # Keep everything measured alive until tracing has stopped
+    del instance, usernames
+
+    if rss := Memory.resident():
+        print(f"Resident memory {rss / 1048576:,.1f} MiB")
+
+    return retained // USERNAMES
+
+
+if __name__ == "__main__":
+    # Logging is not part of the per-username footprint
+    logger.remove()
+
+    retained: int = measure()
+
+    print(f"Retained {retained:,} bytes per username (budget {BUDGET:,} bytes)")
+
+    sys.exit(0 if retained <= BUDGET else 1)